@@ -4,16 +4,38 @@ A Streamlit application for transcribing audio/video files in 99+ languages usin
 """
 
 import streamlit as st
+import gc
+import logging
 import os
 import shutil
+import subprocess
 import tempfile
+import time
+from logging.handlers import MemoryHandler
 from pathlib import Path
 from dotenv import load_dotenv
 
-from utils.audio_processor import convert_to_wav, get_audio_duration, validate_audio_file
-from utils.transcriber import WhisperTranscriber, SUPPORTED_LANGUAGES
+from utils.audio_processor import CREATION_FLAGS, convert_to_wav, convert_and_split, get_audio_duration, validate_audio_file
+from utils.constants import SUPPORTED_LANGUAGES, LANGUAGE_OPTIONS, LANGUAGE_BY_CODE, LANGUAGE_BY_NAME, SUPPORTED_EXTENSIONS
+from utils.exporter import render_srt, render_txt
+from utils.cache import hash_file, make_cache_key, load_cached_result, save_cached_result
 
 
+# Largest chunk uploaded to Whisper, leaving headroom under its 25MB limit
+MAX_CHUNK_BYTES = 20 * 1024 * 1024
+
+# Recordings longer than this are split into chunks of this length: the longest
+# 16kHz mono 16-bit WAV (32,000 bytes/s) that fits in MAX_CHUNK_BYTES (~11 min)
+CHUNK_DURATION_SECONDS = MAX_CHUNK_BYTES // (16000 * 2)
+
+# Minimum time between re-renders of the partial transcript while chunks stream in
+STREAM_RENDER_INTERVAL_SECONDS = 2.0
+
+# Progress log records buffered before writing to the console (warnings flush immediately)
+LOG_BUFFER_RECORDS = 100
+
+logger = logging.getLogger(__name__)
+
 # Load environment variables
 load_dotenv()
 
@@ -25,8 +47,8 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-#   
-st.markdown("""
+# Custom CSS, hoisted out of main() for readability
+CUSTOM_CSS = """
 <style>
     /* Global styles */
     .main {
@@ -91,6 +113,12 @@ st.markdown("""
         letter-spacing: 0.05em;
     }
     
+    .stat-row {
+        display: grid;
+        gap: 1rem;
+        margin-bottom: 1rem;
+    }
+    
     /* Upload Area Polish */
     [data-testid="stFileUploader"] {
         background: rgba(30, 41, 59, 0.4);
@@ -172,18 +200,90 @@ st.markdown("""
         color: #e2e8f0;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
+
+
+def stat_box(value, label, color: str = None) -> str:
+    """
+    Build the HTML for a single stat card.
+    
+    Args:
+        value: Headline value shown in the card
+        label: Caption shown under the value
+        color: Optional accent color for the border and value
+    
+    Returns:
+        HTML string for the card
+    """
+    box_style = f' style="border-color: {color};"' if color else ""
+    value_style = f' style="color: {color};"' if color else ""
+    return (
+        f'<div class="stat-box"{box_style}>'
+        f'<div class="stat-value"{value_style}>{value}</div>'
+        f'<div class="stat-label">{label}</div>'
+        f'</div>'
+    )
+
+
+def stat_row(*boxes: str):
+    """Render a row of stat cards with a single st.markdown call."""
+    st.markdown(
+        f'<div class="stat-row" style="grid-template-columns: repeat({len(boxes)}, 1fr);">'
+        + "".join(boxes)
+        + '</div>',
+        unsafe_allow_html=True
+    )
+
+
+@st.cache_resource(show_spinner=False)
+def get_transcriber(api_key: str):
+    """
+    Get a transcriber for the API key, reused across reruns and uploads.
+    
+    Args:
+        api_key: OpenAI API key
+    
+    Returns:
+        Shared WhisperTranscriber instance
+    """
+    from utils.transcriber import WhisperTranscriber
+    return WhisperTranscriber(api_key)
+
+
+@st.cache_resource(show_spinner=False)
+def configure_logging() -> MemoryHandler:
+    """
+    Route `utils.*` progress logs to the console through a buffered handler, once per process.
+    
+    Returns:
+        The buffering handler, so callers can flush it at the end of a run
+    """
+    console = logging.StreamHandler()
+    console.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s", "%H:%M:%S"))
+    handler = MemoryHandler(capacity=LOG_BUFFER_RECORDS, flushLevel=logging.WARNING, target=console)
+    
+    utils_logger = logging.getLogger("utils")
+    # Drop a handler left behind if the resource cache was cleared
+    for old in [h for h in utils_logger.handlers if isinstance(h, MemoryHandler)]:
+        utils_logger.removeHandler(old)
+        old.close()
+    utils_logger.addHandler(handler)
+    utils_logger.setLevel(logging.INFO)
+    utils_logger.propagate = False
+    return handler
 
 
 def check_ffmpeg():
     """Check if FFmpeg is available on the system."""
-    import subprocess
     try:
         subprocess.run(
             ["ffmpeg", "-version"],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            creationflags=subprocess.CREATE_NO_WINDOW if hasattr(subprocess, 'CREATE_NO_WINDOW') else 0
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            creationflags=CREATION_FLAGS
         )
         return True
     except FileNotFoundError:
@@ -193,6 +293,8 @@ def check_ffmpeg():
 def main():
     """Main application function."""
     
+    configure_logging()
+    
     # Header
     st.markdown("""
     <div class="main-header">
@@ -227,7 +329,7 @@ def main():
         # Language selection
         language_name = st.selectbox(
             "Language",
-            options=list(SUPPORTED_LANGUAGES.keys()),
+            options=LANGUAGE_OPTIONS,
             help="Select the language or choose Auto-detect"
         )
         language_code = SUPPORTED_LANGUAGES[language_name]
@@ -271,8 +373,10 @@ def main():
             for key in list(st.session_state.keys()):
                 del st.session_state[key]
             st.cache_data.clear()
+            # Release the cached client's connections before dropping it
+            if api_key:
+                get_transcriber(api_key).close()
             st.cache_resource.clear()
-            import gc
             gc.collect()
             st.success("Session cleared! Page will reload...")
             st.rerun()
@@ -293,7 +397,7 @@ def main():
     st.markdown("### 📤 Upload Audio/Video File")
     uploaded_file = st.file_uploader(
         "Choose a file",
-        type=['mp3', 'wav', 'm4a', 'flac', 'ogg', 'wma', 'mp4', 'avi', 'mov', 'mkv', 'mts', 'webm'],
+        type=SUPPORTED_EXTENSIONS,
         help="Upload an audio or video file to transcribe"
     )
     
@@ -306,30 +410,11 @@ def main():
         # Display file info
         file_size_mb = uploaded_file.size / (1024 * 1024)
         
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            st.markdown(f"""
-            <div class="stat-box">
-                <div class="stat-value">📄</div>
-                <div class="stat-label">{uploaded_file.name}</div>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        with col2:
-            st.markdown(f"""
-            <div class="stat-box">
-                <div class="stat-value">{file_size_mb:.1f}</div>
-                <div class="stat-label">MB</div>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        with col3:
-            st.markdown(f"""
-            <div class="stat-box">
-                <div class="stat-value">🌐</div>
-                <div class="stat-label">{language_name}</div>
-            </div>
-            """, unsafe_allow_html=True)
+        stat_row(
+            stat_box("📄", uploaded_file.name),
+            stat_box(f"{file_size_mb:.1f}", "MB"),
+            stat_box("🌐", language_name),
+        )
         
         # Warn about large files
         if file_size_mb > 15:
@@ -370,87 +455,115 @@ def process_transcription(
         language_name: Human-readable language name
         prompt: Optional prompt to guide transcription style
     """
-    # Force garbage collection to free memory from previous runs
-    import gc
-    gc.collect()
-    
     try:
         with st.spinner("🔄 Processing your file..."):
             # Create temp directory
             with tempfile.TemporaryDirectory() as temp_dir:
                 temp_path = Path(temp_dir)
                 
-                # Save uploaded file
+                # Save uploaded file in 1MB blocks rather than buffering it all in memory
                 input_file = temp_path / uploaded_file.name
-                input_file.write_bytes(uploaded_file.read())
+                uploaded_file.seek(0)
+                with open(input_file, "wb") as f:
+                    shutil.copyfileobj(uploaded_file, f, length=1024 * 1024)
                 
                 # Progress tracking
                 progress_bar = st.progress(0)
                 status_text = st.empty()
                 
-                # Step 1: Convert to WAV (with normalization)
-                status_text.text("🔊 Converting and normalizing audio...")
-                progress_bar.progress(30)
-                
-                wav_file = temp_path / "audio.wav"
-                convert_to_wav(input_file, wav_file)
-                duration = get_audio_duration(wav_file)
-                
-                # Step 2: Check file size and decide on chunking
-                file_size_mb = wav_file.stat().st_size / (1024 * 1024)
+                # Reuse a previous result for identical audio and settings
+                cache_key = make_cache_key(hash_file(input_file), "whisper-1", language_code, prompt)
+                result = load_cached_result(cache_key)
                 
-                transcriber = WhisperTranscriber(api_key)
-                
-                # If file is over 15MB, use chunking
-                if file_size_mb > 15:
-                    status_text.text(f"⚠️ Large file ({file_size_mb:.1f}MB) - splitting into chunks...")
-                    progress_bar.progress(35)
+                if result is not None:
+                    status_text.text("⚡ Loaded transcription from cache")
+                else:
+                    # Probe the source once to decide whether chunking is needed
+                    duration = get_audio_duration(input_file)
                     
-                    from utils.chunker import split_audio_file
+                    transcriber = get_transcriber(api_key)
                     
-                    # Split into 5-minute chunks (default, outputs as MP3)
-                    chunk_paths = split_audio_file(wav_file)
+                    # Long recordings are converted and split in a single FFmpeg pass. So are
+                    # inputs whose container reports no duration (e.g. MediaRecorder WebM):
+                    # splitting yields a single chunk when they turn out to be short.
+                    duration_known = duration > 0
+                    if not duration_known or duration > CHUNK_DURATION_SECONDS:
+                        if duration_known:
+                            status_text.text(f"🔊 Converting and splitting {duration / 60:.1f} min of audio into chunks...")
+                        else:
+                            status_text.text("🔊 Converting and splitting audio into chunks...")
+                        progress_bar.progress(30)
                     
-                    # Get duration of each chunk
-                    chunk_durations = [get_audio_duration(chunk) for chunk in chunk_paths]
+                        chunk_paths, chunk_durations = convert_and_split(
+                            input_file,
+                            temp_path / "chunks",
+                            segment_time=CHUNK_DURATION_SECONDS,
+                            total_duration=duration if duration_known else None
+                        )
+                        if not duration_known:
+                            # Durations were measured from the converted chunks instead
+                            duration = sum(chunk_durations)
                     
-                    status_text.text(f"📝 Transcribing {len(chunk_paths)} chunks with Whisper...")
-                    progress_bar.progress(40)
+                        status_text.text(f"📝 Transcribing {len(chunk_paths)} chunks with Whisper...")
+                        progress_bar.progress(40)
                     
-                    def update_progress(msg):
-                        status_text.text(msg)
+                        # Show partial transcript as chunks complete instead of waiting for all
+                        segments_box = st.empty()
+                        chunk_results = []
+                        last_render = 0.0
+                        
+                        for i, chunk_result, partial_text in transcriber.transcribe_chunked_stream(
+                            input_file,
+                            chunk_paths,
+                            chunk_durations,
+                            language=language_code,
+                            prompt=prompt,
+                            progress_callback=status_text.text  # Retry notices
+                        ):
+                            chunk_results.append(chunk_result)
+                            
+                            status_text.text(f"📝 Transcribed {i}/{len(chunk_paths)} chunks...")
+                            progress_bar.progress(40 + int(40 * i / len(chunk_paths)))
+                            
+                            # Throttle re-rendering of the growing transcript
+                            now = time.monotonic()
+                            if now - last_render >= STREAM_RENDER_INTERVAL_SECONDS or i == len(chunk_paths):
+                                segments_box.text(partial_text)
+                                last_render = now
+                        
+                        result = transcriber.merge_chunk_results(chunk_results)
+                        segments_box.empty()
                     
-                    result = transcriber.transcribe_chunked(
-                        wav_file,
-                        chunk_paths,
-                        chunk_durations,
-                        language=language_code,
-                        prompt=prompt,
-                        progress_callback=update_progress
-                    )
+                        progress_bar.progress(80)
+                    else:
+                        # Step 1: Convert to WAV (with normalization)
+                        status_text.text("🔊 Converting and normalizing audio...")
+                        progress_bar.progress(30)
                     
-                    # Clean up chunks
-                    if (wav_file.parent / "chunks").exists():
-                        shutil.rmtree(wav_file.parent / "chunks")
+                        wav_file = temp_path / "audio.wav"
+                        convert_to_wav(input_file, wav_file)
+                        file_size_mb = uploaded_file.size / (1024 * 1024)
                     
-                    progress_bar.progress(80)
-                else:
-                    # Small file - direct transcription
-                    status_text.text(f"🎯 Transcribing {file_size_mb:.1f}MB file with Whisper...")
-                    progress_bar.progress(40)
+                        # Small file - direct transcription
+                        status_text.text(f"🎯 Transcribing {file_size_mb:.1f}MB file with Whisper...")
+                        progress_bar.progress(40)
                     
-                    result = transcriber.transcribe(wav_file, language=language_code, prompt=prompt)
+                        result = transcriber.transcribe(wav_file, language=language_code, prompt=prompt)
                     
-                    progress_bar.progress(80)
-                
-                # Clean up transcriber
-                del transcriber
-                
-                # Add duration to result for display
-                result['duration'] = duration
+                        progress_bar.progress(80)
+                    
+                    # Add duration to result for display
+                    result['duration'] = duration
+                    
+                    # The cache is best-effort: a full or unwritable cache dir must not lose the result
+                    try:
+                        save_cached_result(cache_key, result)
+                    except OSError as e:
+                        logger.warning("⚠️ Could not cache transcription result: %s", e)
                 
                 progress_bar.progress(100)
                 status_text.text("✅ Transcription complete!")
+                configure_logging().flush()
                 
                 # Store results in session state so they persist across re-renders
                 st.session_state['transcription_result'] = result
@@ -472,45 +585,23 @@ def display_results(result: dict, filename: str):
         result: Transcription result dict
         filename: Original filename stem for downloads
     """
-    from utils.exporter import export_srt, export_txt, export_full_text
     
     duration = result.get('duration', 0.0)
     
-    col1, col2, col3, col4 = st.columns(4)
-    with col1:
-        st.markdown(f"""
-        <div class="stat-box">
-            <div class="stat-value">{duration:.1f}s</div>
-            <div class="stat-label">Duration</div>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col2:
-        st.markdown(f"""
-        <div class="stat-box">
-            <div class="stat-value">{len(result['segments'])}</div>
-            <div class="stat-label">Segments</div>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col3:
-        detected_lang = result.get('language', 'unknown').upper()
-        st.markdown(f"""
-        <div class="stat-box">
-            <div class="stat-value">{detected_lang}</div>
-            <div class="stat-label">Language</div>
-        </div>
-        """, unsafe_allow_html=True)
-        
-    with col4:
-        confidence = result.get('confidence', 0.0) * 100
-        conf_color = "#10b981" if confidence > 90 else "#f59e0b" if confidence > 80 else "#ef4444"
-        st.markdown(f"""
-        <div class="stat-box" style="border-color: {conf_color};">
-            <div class="stat-value" style="color: {conf_color};">{confidence:.1f}%</div>
-            <div class="stat-label">Confidence</div>
-        </div>
-        """, unsafe_allow_html=True)
+    detected_lang = result.get('language', 'unknown')
+    detected_lang = (
+        LANGUAGE_BY_NAME.get(detected_lang.lower())
+        or LANGUAGE_BY_CODE.get(detected_lang, detected_lang.upper())
+    )
+    confidence = result.get('confidence', 0.0) * 100
+    conf_color = "#10b981" if confidence > 90 else "#f59e0b" if confidence > 80 else "#ef4444"
+    
+    stat_row(
+        stat_box(f"{duration:.1f}s", "Duration"),
+        stat_box(len(result['segments']), "Segments"),
+        stat_box(detected_lang, "Language"),
+        stat_box(f"{confidence:.1f}%", "Confidence", color=conf_color),
+    )
     
     # Tabbed Interface
     tab_transcript, tab_segments, tab_verify = st.tabs([
@@ -530,76 +621,65 @@ def display_results(result: dict, filename: str):
         )
         
         # Generate export data in memory
-        import tempfile as _tmpfile
-        with _tmpfile.TemporaryDirectory() as _td:
-            _tp = Path(_td)
-            
-            srt_file = _tp / "transcript.srt"
-            export_srt(result['segments'], srt_file)
-            
-            txt_file = _tp / "transcript.txt"
-            export_txt(result['segments'], txt_file)
-            
-            full_txt_file = _tp / "transcript_full.txt"
-            export_full_text(result['text'], full_txt_file)
-            
-            # Download buttons
-            st.markdown("### 💾 Download Files")
-            col1, col2, col3 = st.columns(3)
-            
-            with col1:
-                st.download_button(
-                    label="📥 Download SRT",
-                    data=srt_file.read_bytes(),
-                    file_name=f"{filename}.srt",
-                    mime="text/plain",
-                    use_container_width=True
-                )
-            
-            with col2:
-                st.download_button(
-                    label="📥 Download TXT (Segmented)",
-                    data=txt_file.read_bytes(),
-                    file_name=f"{filename}.txt",
-                    mime="text/plain",
-                    use_container_width=True
-                )
-            
-            with col3:
-                st.download_button(
-                    label="📥 Download TXT (Full)",
-                    data=full_txt_file.read_bytes(),
-                    file_name=f"{filename}_full.txt",
-                    mime="text/plain",
-                    use_container_width=True
-                )
+        srt_bytes = render_srt(result['segments']).encode("utf-8")
+        txt_bytes = render_txt(result['segments']).encode("utf-8")
+        full_txt_bytes = result['text'].encode("utf-8")
+        
+        # Download buttons
+        st.markdown("### 💾 Download Files")
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            st.download_button(
+                label="📥 Download SRT",
+                data=srt_bytes,
+                file_name=f"{filename}.srt",
+                mime="text/plain",
+                use_container_width=True
+            )
+        
+        with col2:
+            st.download_button(
+                label="📥 Download TXT (Segmented)",
+                data=txt_bytes,
+                file_name=f"{filename}.txt",
+                mime="text/plain",
+                use_container_width=True
+            )
+        
+        with col3:
+            st.download_button(
+                label="📥 Download TXT (Full)",
+                data=full_txt_bytes,
+                file_name=f"{filename}_full.txt",
+                mime="text/plain",
+                use_container_width=True
+            )
 
     # Tab 2: Segments
     with tab_segments:
         st.markdown("### 📊 Detailed Segments")
         st.info("ℹ️ View confidence scores and timestamps for each segment.")
         
-        import pandas as pd
-        
-        seg_data = []
-        for seg in result['segments']:
-            conf = seg.get('confidence', 0.0)
-            row = {
-                "Start": f"{seg['start']:.2f}s",
-                "End": f"{seg['end']:.2f}s",
-                "Text": seg['text'],
-                "Confidence": f"{conf*100:.1f}%",
-            }
-            seg_data.append(row)
-        
-        if seg_data:
+        if result['segments']:
+            import pandas as pd
+            
+            # Build columns in bulk; number formatting is left to the dataframe renderer
+            seg_df = pd.DataFrame.from_records(
+                ((seg.start, seg.end, seg.text, seg.confidence) for seg in result['segments']),
+                columns=["Start", "End", "Text", "Confidence"]
+            )
+            seg_df["Confidence"] = seg_df["Confidence"].fillna(0.0) * 100
+            
             column_config = {
+                "Start": st.column_config.NumberColumn("Start", format="%.2fs"),
+                "End": st.column_config.NumberColumn("End", format="%.2fs"),
                 "Text": st.column_config.TextColumn("Text", width="large"),
-                "Confidence": st.column_config.TextColumn("Confidence", help="Model confidence score")
+                "Confidence": st.column_config.NumberColumn("Confidence", format="%.1f%%", help="Model confidence score")
             }
             
             st.dataframe(
-                pd.DataFrame(seg_data), 
+                seg_df, 
                 hide_index=True,
                 column_config=column_config
             )
@@ -612,16 +692,15 @@ def display_results(result: dict, filename: str):
         ground_truth = st.text_area("Reference Text (Ground Truth)", height=300, help="Paste the correct transcript here to compare")
         
         if ground_truth and st.button("Calculate Accuracy", type="primary"):
-            import difflib
+            from utils.accuracy import tokenize, word_error_rate, word_diff
             
-            # Normalize texts
-            ref_text = ground_truth.strip()
-            hyp_text = result['text'].strip()
+            # Normalize texts into word tokens
+            ref_tokens = tokenize(ground_truth)
+            hyp_tokens = tokenize(result['text'])
             
-            # Calculate similarity ratio
-            matcher = difflib.SequenceMatcher(None, ref_text, hyp_text)
-            ratio = matcher.ratio()
-            accuracy_pct = ratio * 100
+            # Calculate word error rate
+            wer = word_error_rate(ref_tokens, hyp_tokens)
+            accuracy_pct = max(0.0, 1.0 - wer) * 100
             
             # Display score
             score_color = "#10b981" if accuracy_pct > 90 else "#f59e0b" if accuracy_pct > 80 else "#ef4444"
@@ -633,14 +712,14 @@ def display_results(result: dict, filename: str):
                 <div style="padding: 1rem; border-radius: 0.5rem; background-color: rgba(30, 41, 59, 0.6); border: 2px solid {score_color}; text-align: center; margin: 1rem 0;">
                     <h3 style="margin:0; color: #94a3b8; font-size: 1rem;">Accuracy Score</h3>
                     <h1 style="margin:0; color: {score_color}; font-size: 3rem;">{accuracy_pct:.1f}%</h1>
+                    <p style="margin:0; color: #94a3b8;">WER {wer * 100:.1f}% over {len(ref_tokens)} words</p>
                 </div>
                 """, unsafe_allow_html=True)
             
             with col_diff:
                 # Diff view
                 with st.expander("View Differences", expanded=True):
-                    d = difflib.Differ()
-                    diff = d.compare(ref_text.splitlines(), hyp_text.splitlines())
+                    diff = word_diff(ref_tokens, hyp_tokens)
                     st.markdown("```diff\n" + '\n'.join(diff) + "\n```")
 
 
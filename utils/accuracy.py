@@ -0,0 +1,69 @@
+"""
+Accuracy utilities for comparing transcriptions against reference text.
+Computes token-level word error rate (WER) and word diffs using RapidFuzz.
+"""
+
+import re
+from typing import List
+
+from rapidfuzz.distance import Levenshtein
+
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase word tokens, ignoring punctuation.
+    
+    Args:
+        text: Input text
+    
+    Returns:
+        List of word tokens
+    """
+    return _TOKEN_RE.findall(text.lower())
+
+
+def word_error_rate(ref_tokens: List[str], hyp_tokens: List[str]) -> float:
+    """
+    Compute word error rate between reference and hypothesis tokens.
+    
+    Args:
+        ref_tokens: Reference (ground truth) tokens
+        hyp_tokens: Hypothesis (transcription) tokens
+    
+    Returns:
+        WER as a fraction (0.0 is a perfect match, may exceed 1.0)
+    """
+    if not ref_tokens:
+        return 0.0 if not hyp_tokens else 1.0
+    
+    return Levenshtein.distance(ref_tokens, hyp_tokens) / len(ref_tokens)
+
+
+def word_diff(ref_tokens: List[str], hyp_tokens: List[str]) -> List[str]:
+    """
+    Build diff lines describing how the hypothesis differs from the reference.
+    
+    Args:
+        ref_tokens: Reference (ground truth) tokens
+        hyp_tokens: Hypothesis (transcription) tokens
+    
+    Returns:
+        Lines prefixed with '  ' (match), '- ' (missing) or '+ ' (extra)
+    """
+    lines = []
+    
+    for op in Levenshtein.opcodes(ref_tokens, hyp_tokens):
+        ref_words = " ".join(ref_tokens[op.src_start:op.src_end])
+        hyp_words = " ".join(hyp_tokens[op.dest_start:op.dest_end])
+        
+        if op.tag == "equal":
+            lines.append(f"  {ref_words}")
+        if op.tag in ("delete", "replace"):
+            lines.append(f"- {ref_words}")
+        if op.tag in ("insert", "replace"):
+            lines.append(f"+ {hyp_words}")
+    
+    return lines
@@ -4,47 +4,199 @@ Handles audio conversion, normalization, and format validation using FFmpeg.
 """
 
 import subprocess
-import json
+import os
+import shutil
 from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 
+from utils.constants import SUPPORTED_EXTENSIONS
 
-def convert_to_wav(input_path: Path, output_path: Path, sample_rate: int = 16000) -> Path:
+
+# Size of the canonical RIFF/WAVE header preceding PCM data
+WAV_HEADER_BYTES = 44
+
+# Cap FFmpeg threads so concurrent users on a shared host don't oversubscribe the CPU
+FFMPEG_THREADS = max(1, min(4, (os.cpu_count() or 2) // 2))
+FFMPEG_FILTER_THREADS = 2
+
+# Hide console windows for FFmpeg subprocesses on Windows (0 elsewhere)
+CREATION_FLAGS = getattr(subprocess, 'CREATE_NO_WINDOW', 0)
+
+
+def probe_audio_stream(audio_path: Path) -> Dict:
     """
-    Convert audio/video file to WAV format using FFmpeg with normalization.
+    Read codec, sample rate and channel count of the first audio stream.
     
     Args:
-        input_path: Path to input file
-        output_path: Path to output WAV file
-        sample_rate: Target sample rate (default 16kHz)
+        audio_path: Path to audio file
     
     Returns:
-        Path to converted WAV file
+        Dict with 'codec_name', 'sample_rate' and 'channels' keys,
+        or an empty dict if the file could not be probed
     """
-    output_path.parent.mkdir(parents=True, exist_ok=True)
+    cmd = [
+        "ffprobe",
+        "-v", "error",
+        "-select_streams", "a:0",
+        "-show_entries", "stream=codec_name,sample_rate,channels",
+        "-of", "default=noprint_wrappers=1",
+        str(audio_path)
+    ]
+    
+    result = subprocess.run(
+        cmd,
+        capture_output=True,
+        text=True,
+        creationflags=CREATION_FLAGS
+    )
     
+    if result.returncode == 0:
+        # Output is one "key=value" line per requested field
+        fields = dict(
+            line.split('=', 1) for line in result.stdout.splitlines() if '=' in line
+        )
+        if fields:
+            try:
+                return {
+                    'codec_name': fields.get('codec_name'),
+                    'sample_rate': int(fields.get('sample_rate', 0)),
+                    'channels': int(fields.get('channels', 0)),
+                }
+            except ValueError:
+                pass  # Field reported as "N/A"
+    
+    return {}
+
+
+def _build_convert_cmd(input_path: Path, sample_rate: int, normalize: bool) -> List[str]:
+    """Build the shared FFmpeg decode/resample/normalize arguments (without output)."""
     # Combine conversion and normalization in one FFmpeg pass
     cmd = [
         "ffmpeg",
         "-y",  # Overwrite output file
+        "-hide_banner",
+        "-loglevel", "error",  # Keep stderr empty unless something fails
+        "-threads", str(FFMPEG_THREADS),  # Input option: caps the decoder, where the CPU goes
         "-i", str(input_path),
         "-ac", "1",  # Mono
         "-ar", str(sample_rate),  # Sample rate
-        "-af", "loudnorm=I=-20:TP=-1.5:LRA=11",  # Loudness normalization
+    ]
+    if normalize:
+        # Single-pass dynamic normalization (much cheaper than EBU R128 loudnorm)
+        cmd += ["-af", "dynaudnorm=f=150:g=15"]
+    cmd += [
         "-vn",  # No video
-        str(output_path),
+        "-filter_threads", str(FFMPEG_FILTER_THREADS),
     ]
+    return cmd
+
+
+def convert_to_wav(
+    input_path: Path,
+    output_path: Path,
+    sample_rate: int = 16000,
+    normalize: bool = True
+) -> Path:
+    """
+    Convert audio/video file to WAV format using FFmpeg with normalization.
+    
+    Inputs that are already 16-bit PCM WAV at the target sample rate and mono
+    are copied as-is instead of being decoded and re-encoded.
+    
+    Args:
+        input_path: Path to input file
+        output_path: Path to output WAV file
+        sample_rate: Target sample rate (default 16kHz)
+        normalize: Apply dynamic loudness normalization (default True)
+    
+    Returns:
+        Path to converted WAV file
+    """
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    
+    # Skip FFmpeg entirely when the input already matches the target format
+    if input_path.suffix.lower() == '.wav':
+        stream = probe_audio_stream(input_path)
+        if (stream.get('codec_name') == 'pcm_s16le'
+                and stream.get('sample_rate') == sample_rate
+                and stream.get('channels') == 1):
+            shutil.copyfile(input_path, output_path)
+            return output_path
+    
+    cmd = _build_convert_cmd(input_path, sample_rate, normalize) + [str(output_path)]
     
     subprocess.run(
-        cmd, 
-        check=True, 
-        stdout=subprocess.PIPE, 
-        stderr=subprocess.PIPE,
-        creationflags=subprocess.CREATE_NO_WINDOW if hasattr(subprocess, 'CREATE_NO_WINDOW') else 0
+        cmd,
+        check=True,
+        stdin=subprocess.DEVNULL,  # FFmpeg otherwise listens for interactive keys
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,  # Only error messages, attached to CalledProcessError
+        creationflags=CREATION_FLAGS
     )
     
     return output_path
 
 
+def convert_and_split(
+    input_path: Path,
+    output_dir: Path,
+    segment_time: int,
+    sample_rate: int = 16000,
+    normalize: bool = True,
+    total_duration: Optional[float] = None
+) -> Tuple[List[Path], List[float]]:
+    """
+    Convert audio/video file to WAV chunks in a single FFmpeg pass.
+    
+    Uses FFmpeg's segment muxer so the input is decoded and normalized once
+    while chunk files are written out as the stream progresses.
+    
+    Args:
+        input_path: Path to input file
+        output_dir: Directory to write chunk files into
+        segment_time: Duration of each chunk in seconds
+        sample_rate: Target sample rate (default 16kHz)
+        normalize: Apply dynamic loudness normalization (default True)
+        total_duration: Known duration of the input in seconds, if already probed
+    
+    Returns:
+        Tuple of (chunk paths, chunk durations in seconds)
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    
+    cmd = _build_convert_cmd(input_path, sample_rate, normalize) + [
+        "-f", "segment",
+        "-segment_time", str(segment_time),
+        "-reset_timestamps", "1",
+        str(output_dir / "chunk_%03d.wav"),
+    ]
+    
+    subprocess.run(
+        cmd,
+        check=True,
+        stdin=subprocess.DEVNULL,  # FFmpeg otherwise listens for interactive keys
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,  # Only error messages, attached to CalledProcessError
+        creationflags=CREATION_FLAGS
+    )
+    
+    chunk_paths = sorted(output_dir.glob("chunk_*.wav"))
+    
+    if total_duration is not None and chunk_paths:
+        # Every chunk is exactly segment_time long except the remainder at the end
+        last_duration = max(0.0, total_duration - segment_time * (len(chunk_paths) - 1))
+        chunk_durations = [float(segment_time)] * (len(chunk_paths) - 1) + [last_duration]
+    else:
+        # Output is fixed 16-bit mono PCM, so duration follows from the data size
+        bytes_per_second = sample_rate * 2
+        chunk_durations = [
+            max(0, os.path.getsize(chunk) - WAV_HEADER_BYTES) / bytes_per_second
+            for chunk in chunk_paths
+        ]
+    
+    return chunk_paths, chunk_durations
+
+
 def get_audio_duration(audio_path: Path) -> float:
     """
     Get duration of audio file in seconds using FFprobe.
@@ -57,10 +209,9 @@ def get_audio_duration(audio_path: Path) -> float:
     """
     cmd = [
         "ffprobe",
-        "-v", "quiet",
-        "-print_format", "json",
-        "-show_format",
-        "-show_streams",
+        "-v", "error",
+        "-show_entries", "format=duration",
+        "-of", "default=noprint_wrappers=1:nokey=1",
         str(audio_path)
     ]
     
@@ -68,13 +219,14 @@ def get_audio_duration(audio_path: Path) -> float:
         cmd,
         capture_output=True,
         text=True,
-        creationflags=subprocess.CREATE_NO_WINDOW if hasattr(subprocess, 'CREATE_NO_WINDOW') else 0
+        creationflags=CREATION_FLAGS
     )
     
     if result.returncode == 0:
-        data = json.loads(result.stdout)
-        if 'format' in data and 'duration' in data['format']:
-            return float(data['format']['duration'])
+        try:
+            return float(result.stdout.strip())
+        except ValueError:
+            pass  # No duration reported (e.g. "N/A")
     
     return 0.0
 
@@ -89,10 +241,4 @@ def validate_audio_file(file_path: Path) -> bool:
     Returns:
         True if valid, False otherwise
     """
-    supported_formats = {
-        '.mp3', '.wav', '.m4a', '.flac', '.ogg', '.wma',
-        '.mp4', '.avi', '.mov', '.mkv', '.mts', '.webm'
-    }
-    
-    return file_path.suffix.lower() in supported_formats
-
+    return file_path.suffix.lower().lstrip('.') in SUPPORTED_EXTENSIONS
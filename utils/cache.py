@@ -0,0 +1,131 @@
+"""
+Result caching utilities for transcription app.
+Stores transcription results on disk keyed by a content hash of the audio.
+"""
+
+import dataclasses
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, Optional
+
+from utils.segment import Segment
+
+
+CACHE_DIR = Path.home() / ".cache" / "audio_transcriber"
+MAX_CACHE_ENTRIES = 128
+
+
+def hash_file(file_path: Path, block_size: int = 1024 * 1024) -> str:
+    """
+    Compute a BLAKE2b content hash of a file, reading it in blocks.
+    
+    Args:
+        file_path: Path to file
+        block_size: Number of bytes read per block (default 1MB)
+    
+    Returns:
+        Hex digest of the file contents
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def make_cache_key(content_hash: str, *params) -> str:
+    """
+    Combine a content hash with the parameters that affect the result.
+    
+    Args:
+        content_hash: Hash of the audio content
+        *params: JSON-serializable parameters (model, language, prompt, ...)
+    
+    Returns:
+        Cache key string
+    """
+    payload = json.dumps([content_hash, *params], ensure_ascii=False)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=20).hexdigest()
+
+
+def load_cached_result(key: str) -> Optional[Dict]:
+    """
+    Load a cached transcription result.
+    
+    Args:
+        key: Cache key from make_cache_key
+    
+    Returns:
+        Cached result dict (segments as Segment objects), or None on a cache miss
+    """
+    cache_file = CACHE_DIR / f"{key}.json"
+    try:
+        with open(cache_file, "r", encoding="utf-8") as f:
+            result = json.load(f)
+        result['segments'] = [Segment(**seg) for seg in result['segments']]
+    except (OSError, ValueError, KeyError, TypeError):
+        # Unreadable, corrupt or not a transcription result - treat as a miss
+        return None
+    
+    # Touch the entry so eviction keeps recently used results
+    try:
+        os.utime(cache_file)
+    except OSError:
+        pass  # Evicted by another writer meanwhile - the loaded result is still valid
+    return result
+
+
+def save_cached_result(key: str, result: Dict) -> Path:
+    """
+    Save a transcription result to the cache atomically.
+    
+    Args:
+        key: Cache key from make_cache_key
+        result: Transcription result dict
+    
+    Returns:
+        Path to the cache file
+    """
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    cache_file = CACHE_DIR / f"{key}.json"
+    
+    # Write to a temp file then rename so readers never see partial JSON
+    fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, default=_encode_segment)
+        os.replace(tmp_path, cache_file)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    
+    _evict_old_entries()
+    return cache_file
+
+
+def _encode_segment(obj) -> Dict:
+    """JSON fallback encoder: Segment objects are stored as plain dicts."""
+    if isinstance(obj, Segment):
+        return dataclasses.asdict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _evict_old_entries():
+    """Remove least recently used entries beyond MAX_CACHE_ENTRIES."""
+    # Entries can disappear under us when several threads save at once
+    entries = []
+    for path in CACHE_DIR.glob("*.json"):
+        try:
+            entries.append((path.stat().st_mtime, path))
+        except OSError:
+            continue
+    
+    entries.sort(reverse=True)
+    for _, stale in entries[MAX_CACHE_ENTRIES:]:
+        try:
+            stale.unlink()
+        except OSError:
+            pass
@@ -0,0 +1,65 @@
+"""
+Shared constants for transcription app.
+Kept free of heavy imports so the UI can load them cheaply at startup.
+"""
+
+from types import MappingProxyType
+from typing import Final, Mapping, Optional
+
+
+# File extensions (without dot) accepted for upload
+SUPPORTED_EXTENSIONS = (
+    'mp3', 'wav', 'm4a', 'flac', 'ogg', 'wma',
+    'mp4', 'avi', 'mov', 'mkv', 'mts', 'webm'
+)
+
+# Language mapping for dropdown (read-only)
+SUPPORTED_LANGUAGES: Final[Mapping[str, Optional[str]]] = MappingProxyType({
+    'Auto-detect': None,
+    'English': 'en',
+    'Malay': 'ms',
+    'Chinese (Mandarin)': 'zh',
+    'Tamil': 'ta',
+    'Spanish': 'es',
+    'French': 'fr',
+    'German': 'de',
+    'Italian': 'it',
+    'Portuguese': 'pt',
+    'Russian': 'ru',
+    'Japanese': 'ja',
+    'Korean': 'ko',
+    'Arabic': 'ar',
+    'Hindi': 'hi',
+    'Bengali': 'bn',
+    'Turkish': 'tr',
+    'Vietnamese': 'vi',
+    'Thai': 'th',
+    'Indonesian': 'id',
+    'Dutch': 'nl',
+    'Polish': 'pl',
+    'Swedish': 'sv',
+    'Norwegian': 'no',
+    'Danish': 'da',
+    'Finnish': 'fi',
+    'Greek': 'el',
+    'Hebrew': 'he',
+    'Romanian': 'ro',
+    'Hungarian': 'hu',
+    'Czech': 'cs',
+    'Ukrainian': 'uk',
+})
+
+# Dropdown options, built once at import
+LANGUAGE_OPTIONS: Final = tuple(SUPPORTED_LANGUAGES.keys())
+
+# Reverse lookup: language code -> display name
+LANGUAGE_BY_CODE: Final[Mapping[str, str]] = MappingProxyType({
+    code: name for name, code in SUPPORTED_LANGUAGES.items() if code is not None
+})
+
+# Whisper reports the detected language as a lowercase English name
+# ("english", "chinese"), so match on the name without any qualifier
+LANGUAGE_BY_NAME: Final[Mapping[str, str]] = MappingProxyType({
+    name.split(' (')[0].lower(): name
+    for name, code in SUPPORTED_LANGUAGES.items() if code is not None
+})
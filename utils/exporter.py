@@ -3,11 +3,15 @@ Export utilities for transcription formats.
 Handles SRT and TXT file generation.
 """
 
+import io
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict
-from datetime import timedelta
+from typing import List, TextIO
 
+from utils.segment import Segment
 
+
+@lru_cache(maxsize=4096)
 def format_timestamp_srt(seconds: float) -> str:
     """
     Format seconds to SRT timestamp format (HH:MM:SS,mmm).
@@ -18,75 +22,101 @@ def format_timestamp_srt(seconds: float) -> str:
     Returns:
         Formatted timestamp string
     """
-    td = timedelta(seconds=seconds)
-    total_ms = int(td.total_seconds() * 1000)
-    hours = total_ms // 3_600_000
-    minutes = (total_ms % 3_600_000) // 60_000
-    secs = (total_ms % 60_000) // 1000
-    milliseconds = total_ms % 1000
+    milliseconds = int(seconds * 1000 + 0.5)
+    hours, milliseconds = divmod(milliseconds, 3_600_000)
+    minutes, milliseconds = divmod(milliseconds, 60_000)
+    secs, milliseconds = divmod(milliseconds, 1000)
     
     return f"{hours:02}:{minutes:02}:{secs:02},{milliseconds:03}"
 
 
-def export_srt(segments: List[Dict], output_path: Path) -> Path:
+def _write_srt(segments: List[Segment], out: TextIO) -> None:
+    """Write segments as SRT blocks to a text stream, one write per subtitle."""
+    for idx, segment in enumerate(segments, start=1):
+        text = segment.text.strip()
+        
+        if not text:
+            continue
+        
+        start_time = format_timestamp_srt(segment.start)
+        end_time = format_timestamp_srt(segment.end)
+        out.write(f"{idx}\n{start_time} --> {end_time}\n{text}\n\n")
+
+
+def render_srt(segments: List[Segment]) -> str:
+    """
+    Render segments as SRT subtitle text.
+    
+    Args:
+        segments: List of transcript segments
+    
+    Returns:
+        SRT formatted string
+    """
+    buf = io.StringIO()
+    _write_srt(segments, buf)
+    return buf.getvalue()
+
+
+def export_srt(segments: List[Segment], output_path: Path) -> Path:
     """
     Export segments to SRT subtitle format.
     
     Args:
-        segments: List of dicts with 'start', 'end', 'text' keys
+        segments: List of transcript segments
         output_path: Path to save SRT file
     
     Returns:
         Path to saved SRT file
     """
-    lines = []
-    
-    for idx, segment in enumerate(segments, start=1):
-        start_time = format_timestamp_srt(segment['start'])
-        end_time = format_timestamp_srt(segment['end'])
-        text = segment['text'].strip()
-        
-        if not text:
-            continue
-        
-        lines.append(str(idx))
-        lines.append(f"{start_time} --> {end_time}")
-        lines.append(text)
-        lines.append("")  # Empty line between subtitles
-    
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text("\n".join(lines), encoding="utf-8")
+    with open(output_path, "w", encoding="utf-8", buffering=1 << 20) as f:
+        _write_srt(segments, f)
     
     return output_path
 
 
-def export_txt(segments: List[Dict], output_path: Path, include_timestamps: bool = False) -> Path:
+def render_txt(segments: List[Segment], include_timestamps: bool = False) -> str:
     """
-    Export segments to plain text format.
+    Render segments as plain text, one segment per line.
     
     Args:
-        segments: List of dicts with 'start', 'end', 'text' keys
-        output_path: Path to save TXT file
+        segments: List of transcript segments
         include_timestamps: Whether to include timestamps in output
     
     Returns:
-        Path to saved TXT file
+        Plain text string
     """
     lines = []
     
     for segment in segments:
-        text = segment['text'].strip()
+        text = segment.text.strip()
         if not text:
             continue
         
         if include_timestamps:
-            start_time = format_timestamp_srt(segment['start'])
+            start_time = format_timestamp_srt(segment.start)
             lines.append(f"[{start_time}] {text}")
         else:
             lines.append(text)
     
+    return "\n".join(lines)
+
+
+def export_txt(segments: List[Segment], output_path: Path, include_timestamps: bool = False) -> Path:
+    """
+    Export segments to plain text format.
+    
+    Args:
+        segments: List of transcript segments
+        output_path: Path to save TXT file
+        include_timestamps: Whether to include timestamps in output
+    
+    Returns:
+        Path to saved TXT file
+    """
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text("\n".join(lines), encoding="utf-8")
+    output_path.write_text(render_txt(segments, include_timestamps), encoding="utf-8")
     
     return output_path
 
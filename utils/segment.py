@@ -0,0 +1,28 @@
+"""
+Transcript segment type shared by the transcriber, exporters and UI.
+Kept free of heavy imports so the UI can load it cheaply at startup.
+"""
+
+from dataclasses import dataclass
+
+
+@dataclass
+class Segment:
+    """
+    One timed span of a transcript.
+    
+    Slotted (declared by hand, as `slots=True` needs Python 3.10) so long
+    transcripts don't carry a per-segment attribute dict.
+    
+    Attributes:
+        start: Start time in seconds
+        end: End time in seconds
+        text: Transcribed text
+        confidence: Model confidence between 0 and 1 (0.0 if unscored)
+    """
+    __slots__ = ('start', 'end', 'text', 'confidence')
+    
+    start: float
+    end: float
+    text: str
+    confidence: float
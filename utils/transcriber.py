@@ -4,41 +4,99 @@ Handles transcription with timestamps for multiple languages.
 """
 
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Iterator, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor, wait
+import asyncio
+import itertools
 import math
+import os
+import queue
+import random
 import time
-from openai import OpenAI, APIStatusError
+import logging
+from openai import AsyncOpenAI, OpenAI, APIConnectionError, APIStatusError
+
+# Re-exported so existing `from utils.transcriber import SUPPORTED_LANGUAGES` keeps working
+from utils.constants import SUPPORTED_LANGUAGES
+from utils.segment import Segment
+from utils.cache import hash_file, make_cache_key, load_cached_result, save_cached_result
+
+
+logger = logging.getLogger(__name__)
+
+WHISPER_MODEL = "whisper-1"
+
+# Upper bound on simultaneous Whisper API requests when transcribing chunks
+MAX_CONCURRENT_CHUNKS = 6
+
+# How often the consuming thread checks for retry notices while waiting on a chunk
+RETRY_NOTICE_POLL_SECONDS = 0.5
+
+# Chunk retries: dropped connections, rate limiting and transient server/gateway errors
+MAX_CHUNK_ATTEMPTS = 5
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+MAX_BACKOFF_SECONDS = 30
+
+API_TIMEOUT_SECONDS = 600.0  # 10-minute timeout for very large files
 
 
 class WhisperTranscriber:
     """Transcriber using OpenAI Whisper API."""
     
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, use_cache: bool = True):
         """
         Initialize transcriber with API key.
         
         Args:
             api_key: OpenAI API key
+            use_cache: Reuse on-disk results for audio that was already transcribed
         """
+        self.use_cache = use_cache
         self.client = OpenAI(
             api_key=api_key,
-            timeout=600.0,  # 10-minute timeout for very large files
+            timeout=API_TIMEOUT_SECONDS,
             max_retries=3   # Retry up to 3 times on failure
         )
+        # Fixed request parameters, copied per call (verbose_json gives detailed timestamps)
+        self._api_params_base = {"model": WHISPER_MODEL, "response_format": "verbose_json"}
+        # Created on first async use; see _get_async_client
+        self._async_client = None
+        self._async_client_loop = None
     
-    def __del__(self):
-        """Cleanup when transcriber is destroyed."""
-        try:
-            if hasattr(self, 'client'):
-                self.client.close()
-        except:
-            pass
+    def close(self):
+        """
+        Release the client's pooled connections.
+        
+        An async client can only be closed from its event loop (see `aclose`);
+        here it is just dropped.
+        """
+        self.client.close()
+        self._async_client = None
+        self._async_client_loop = None
+    
+    async def aclose(self):
+        """Release both the async client's connections and the sync client's."""
+        await self._close_async_client()
+        self.close()
+    
+    def __enter__(self) -> "WhisperTranscriber":
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    async def __aenter__(self) -> "WhisperTranscriber":
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
     
     def transcribe(
         self, 
         audio_path: Path, 
         language: Optional[str] = None,
-        prompt: Optional[str] = None
+        prompt: Optional[str] = None,
+        file_size_mb: Optional[float] = None
     ) -> Dict:
         """
         Transcribe audio file using Whisper API.
@@ -47,15 +105,127 @@ class WhisperTranscriber:
             audio_path: Path to audio file
             language: Language code (e.g., 'en', 'ms', 'zh') or None for auto-detection
             prompt: Optional prompt to guide transcription style (e.g., for mixed languages)
+            file_size_mb: File size if already known (skips a stat call)
+        
+        Returns:
+            Dict with 'text' and 'segments' (timed Segment objects)
+        
+        Raises:
+            ValueError: If file is too large (>25MB)
+        """
+        file_size_mb, cache_key, cached = self._prepare(audio_path, language, prompt, file_size_mb)
+        if cached is not None:
+            return cached
+        
+        start_time = time.time()
+        with open(audio_path, "rb") as audio_file:
+            api_params = self._build_api_params(audio_file, language, prompt)
+            try:
+                response = self.client.audio.transcriptions.create(**api_params)
+            except APIStatusError as e:
+                self._log_api_error(e, audio_path, file_size_mb)
+                raise
+        
+        result = self._finish_upload(response, language, start_time)
+        if cache_key:
+            self._save_to_cache(cache_key, result)
+        
+        return result
+    
+    async def atranscribe(
+        self,
+        audio_path: Path,
+        language: Optional[str] = None,
+        prompt: Optional[str] = None,
+        file_size_mb: Optional[float] = None
+    ) -> Dict:
+        """
+        Transcribe audio file using Whisper API without blocking the event loop.
+        
+        Same behaviour and result as `transcribe`, but the upload goes through
+        the async client so many chunks can be in flight from one thread.
+        
+        Args:
+            audio_path: Path to audio file
+            language: Language code (e.g., 'en', 'ms', 'zh') or None for auto-detection
+            prompt: Optional prompt to guide transcription style (e.g., for mixed languages)
+            file_size_mb: File size if already known (skips a stat call)
         
         Returns:
-            Dict with 'text' and 'segments' containing transcription and timestamps
+            Dict with 'text' and 'segments' (timed Segment objects)
         
         Raises:
             ValueError: If file is too large (>25MB)
         """
+        loop = asyncio.get_running_loop()
+        # Hashing for the cache lookup reads the whole file - keep it off the event loop
+        file_size_mb, cache_key, cached = await loop.run_in_executor(
+            None, self._prepare, audio_path, language, prompt, file_size_mb
+        )
+        if cached is not None:
+            return cached
+        
+        client = self._get_async_client()
+        start_time = time.time()
+        with open(audio_path, "rb") as audio_file:
+            api_params = self._build_api_params(audio_file, language, prompt)
+            try:
+                response = await client.audio.transcriptions.create(**api_params)
+            except APIStatusError as e:
+                self._log_api_error(e, audio_path, file_size_mb)
+                raise
+        
+        result = self._finish_upload(response, language, start_time)
+        if cache_key:
+            await loop.run_in_executor(None, self._save_to_cache, cache_key, result)
+        
+        return result
+    
+    def _get_async_client(self) -> AsyncOpenAI:
+        """
+        Async client for the running event loop, created on first use.
+        
+        An async connection pool is bound to the loop that opened it, so a new
+        client is made if called from a different loop (e.g. a later asyncio.run).
+        A client left over from an earlier loop can no longer be closed from
+        this one, which is why `transcribe_chunked_async` closes its client
+        before returning; direct `atranscribe` callers should use `aclose` or
+        `async with`.
+        """
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_client_loop is not loop:
+            self._async_client = AsyncOpenAI(
+                api_key=self.client.api_key,
+                timeout=API_TIMEOUT_SECONDS,
+                max_retries=3
+            )
+            self._async_client_loop = loop
+        return self._async_client
+    
+    async def _close_async_client(self):
+        """Close the async client if it belongs to the running loop, and forget it."""
+        client, loop = self._async_client, self._async_client_loop
+        self._async_client = None
+        self._async_client_loop = None
+        if client is not None and loop is asyncio.get_running_loop():
+            await client.close()
+    
+    def _prepare(
+        self,
+        audio_path: Path,
+        language: Optional[str],
+        prompt: Optional[str],
+        file_size_mb: Optional[float]
+    ) -> Tuple[float, Optional[str], Optional[Dict]]:
+        """
+        Check the upload size limit and look up a cached result.
+        
+        Returns:
+            Tuple of (file size in MB, cache key or None, cached result or None)
+        """
         # Check file size (Whisper API limit is 25MB)
-        file_size_mb = audio_path.stat().st_size / (1024 * 1024)
+        if file_size_mb is None:
+            file_size_mb = audio_path.stat().st_size / (1024 * 1024)
         if file_size_mb > 24:  # Strict limit
             raise ValueError(
                 f"Audio file is {file_size_mb:.1f}MB. "
@@ -63,77 +233,105 @@ class WhisperTranscriber:
                 f"The file will need to be chunked into smaller segments."
             )
         
+        # Identical audio with identical settings was transcribed before - skip the API call
+        cache_key = None
+        if self.use_cache:
+            cache_key = make_cache_key(
+                hash_file(audio_path), "transcribe", WHISPER_MODEL, language, prompt
+            )
+            cached = load_cached_result(cache_key)
+            if cached is not None:
+                logger.info("⚡ Using cached transcription for %s", audio_path.name)
+                return file_size_mb, cache_key, cached
+        
         if file_size_mb > 20:
-            print(f"⚠️ Large file: {file_size_mb:.1f}MB - upload may take several minutes...")
+            logger.warning("⚠️ Large file: %.1fMB - upload may take several minutes...", file_size_mb)
+        logger.info("📤 [Start] Uploading %.1fMB to Whisper API...", file_size_mb)
         
-        start_time = time.time()
-        print(f"📤 [Start] Uploading {file_size_mb:.1f}MB to Whisper API at {time.strftime('%H:%M:%S')}...")
+        return file_size_mb, cache_key, None
+    
+    def _finish_upload(self, response, language: Optional[str], start_time: float) -> Dict:
+        """Log the API round trip and convert the response into a transcription result."""
+        elapsed = time.time() - start_time
+        logger.info("✅ [Complete] Transcription received from API in %.1fs", elapsed)
+        return self._build_result(response.model_dump(), language)
+    
+    @staticmethod
+    def _save_to_cache(cache_key: str, result: Dict):
+        """Store a result in the cache; a failed write must not fail the transcription."""
+        try:
+            save_cached_result(cache_key, result)
+        except OSError as e:
+            logger.warning("⚠️ Could not cache transcription result: %s", e)
+    
+    def _build_api_params(
+        self,
+        audio_file,
+        language: Optional[str],
+        prompt: Optional[str]
+    ) -> Dict:
+        """Keyword arguments for `audio.transcriptions.create`."""
+        api_params = self._api_params_base.copy()
+        api_params["file"] = audio_file
         
-        with open(audio_path, "rb") as audio_file:
-            # Use verbose_json to get detailed timestamps
-            # Build API call parameters
-            api_params = {
-                "model": "whisper-1",
-                "file": audio_file,
-                "response_format": "verbose_json"
-            }
-            
-            # Add optional parameters
-            if language:
-                api_params["language"] = language
-            if prompt:
-                api_params["prompt"] = prompt
-            
-            try:
-                response = self.client.audio.transcriptions.create(**api_params)
-            except APIStatusError as e:
-                print(f"❌ API Error {e.status_code}: {e.message}")
-                print(f"   File: {audio_path.name} ({file_size_mb:.1f}MB)")
-                raise
+        # Add optional parameters
+        if language:
+            api_params["language"] = language
+        if prompt:
+            api_params["prompt"] = prompt
         
-        elapsed = time.time() - start_time
-        print(f"✅ [Complete] Transcription received from API in {elapsed:.1f}s")
+        return api_params
+    
+    @staticmethod
+    def _log_api_error(error: APIStatusError, audio_path: Path, file_size_mb: float):
+        """Log a failed upload with the file it was for."""
+        logger.error(
+            "❌ API Error %s: %s (file: %s, %.1fMB)",
+            error.status_code, error.message, audio_path.name, file_size_mb
+        )
+    
+    @staticmethod
+    def _build_result(data: Dict, language: Optional[str]) -> Dict:
+        """
+        Convert a verbose_json response (as plain dicts) into a transcription result.
         
-        # Extract segments with timestamps and confidence
+        Args:
+            data: `model_dump()` of the API response
+            language: Language code that was requested, used if none is detected
+        
+        Returns:
+            Dict with 'text', 'language', 'confidence' and 'segments'
+        """
+        detected_language = data.get('language') or language or 'unknown'
+        
+        if not data.get('segments'):
+            # Fallback: single untimed segment when none are returned
+            return {
+                'text': data['text'],
+                'language': detected_language,
+                'confidence': 0.0,
+                'segments': [Segment(0.0, 0.0, data['text'], 0.0)]
+            }
+        
+        # Single pass: per-segment confidence plus the running sum for the overall mean
         segments = []
-        total_logprob = 0.0
-        count_segments = 0
-        
-        if hasattr(response, 'segments') and response.segments:
-            for seg in response.segments:
-                # Segments are objects, not dicts - use attribute access
-                avg_logprob = getattr(seg, 'avg_logprob', -1.0)
-                confidence = math.exp(avg_logprob) if avg_logprob != -1.0 else 0.0
-                
-                # track for average
-                if avg_logprob != -1.0:
-                    total_logprob += avg_logprob
-                    count_segments += 1
-
-                segments.append({
-                    'start': getattr(seg, 'start', 0.0),
-                    'end': getattr(seg, 'end', 0.0),
-                    'text': getattr(seg, 'text', '').strip(),
-                    'confidence': confidence
-                })
-        else:
-            # Fallback: create single segment if no segments returned
-            segments = [{
-                'start': 0.0,
-                'end': 0.0,
-                'text': response.text,
-                'confidence': 0.0
-            }]
-        
-        # Calculate overall confidence
-        avg_confidence = 0.0
-        if count_segments > 0:
-            avg_confidence = math.exp(total_logprob / count_segments)
-
+        logprob_sum = 0.0
+        scored = 0
+        for seg in data['segments']:
+            avg_logprob = seg['avg_logprob']
+            if avg_logprob != -1.0:
+                confidence = math.exp(avg_logprob)
+                logprob_sum += avg_logprob
+                scored += 1
+            else:
+                confidence = 0.0
+            segments.append(Segment(seg['start'], seg['end'], seg['text'].strip(), confidence))
+        
         return {
-            'text': response.text,
-            'language': getattr(response, 'language', language or 'unknown'),
-            'confidence': avg_confidence,
+            'text': data['text'],
+            'language': detected_language,
+            # Overall confidence from the mean log-probability of scored segments
+            'confidence': math.exp(logprob_sum / scored) if scored else 0.0,
             'segments': segments
         }
     
@@ -149,6 +347,8 @@ class WhisperTranscriber:
         """
         Transcribe multiple audio chunks and merge results.
         
+        Chunks are uploaded concurrently (up to MAX_CONCURRENT_CHUNKS at once).
+        
         Args:
             audio_path: Original audio file path (for reference)
             chunk_paths: List of chunk file paths
@@ -161,102 +361,311 @@ class WhisperTranscriber:
             Combined transcription result
         """
         results = []
-        time_offset = 0.0
         
-        for i, chunk_path in enumerate(chunk_paths, 1):
+        # Chunks upload concurrently; results still arrive in chunk order with offsets applied
+        for i, chunk_result, _ in self.transcribe_chunked_stream(
+            audio_path, chunk_paths, chunk_durations, language=language, prompt=prompt,
+            progress_callback=progress_callback
+        ):
+            results.append(chunk_result)
             if progress_callback:
-                progress_callback(f"📝 Transcribing chunk {i}/{len(chunk_paths)}...")
-            
-            print(f"Transcribing chunk {i}/{len(chunk_paths)}: {chunk_path.name}")
-            
-            # Transcribe this chunk with retry logic for transient API errors
-            max_retries = 5
-            chunk_result = None
-            for attempt in range(1, max_retries + 1):
+                progress_callback(f"📝 Transcribed chunk {i}/{len(chunk_paths)}...")
+        
+        return self.merge_chunk_results(results)
+    
+    async def transcribe_chunked_async(
+        self,
+        audio_path: Path,
+        chunk_paths: List[Path],
+        chunk_durations: List[float],
+        language: Optional[str] = None,
+        prompt: Optional[str] = None,
+        progress_callback=None,
+        max_concurrency: int = MAX_CONCURRENT_CHUNKS
+    ) -> Dict:
+        """
+        Transcribe multiple audio chunks concurrently and merge results.
+        
+        Chunks are uploaded as coroutines on the async client from a single
+        thread, with at most `max_concurrency` requests in flight at once.
+        For callers that already run an event loop; the Streamlit app, which
+        renders from synchronous code, uses `transcribe_chunked_stream`.
+        
+        Args:
+            audio_path: Original audio file path (for reference)
+            chunk_paths: List of chunk file paths
+            chunk_durations: Duration of each chunk for time offset calculation
+            language: Language code or None for auto-detect
+            prompt: Optional prompt to guide transcription style
+            progress_callback: Optional callback function for progress updates
+            max_concurrency: Maximum number of chunks transcribed at once
+        
+        Returns:
+            Combined transcription result
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        sizes_mb = self._file_sizes_mb(chunk_paths)
+        total = len(chunk_paths)
+        completed = 0
+        
+        async def run_chunk(i: int, chunk_path: Path) -> Dict:
+            nonlocal completed
+            async with semaphore:
+                chunk_result = await self._atranscribe_with_retry(
+                    chunk_path, i, language, prompt, progress_callback,
+                    file_size_mb=sizes_mb.get(chunk_path)
+                )
+            completed += 1
+            if progress_callback:
+                progress_callback(f"📝 Transcribed {completed}/{total} chunks...")
+            return chunk_result
+        
+        try:
+            results = await asyncio.gather(
+                *(run_chunk(i, chunk_path) for i, chunk_path in enumerate(chunk_paths, 1))
+            )
+        finally:
+            # The client's pool is bound to this loop; release it rather than leak it
+            await self._close_async_client()
+        
+        results = list(results)
+        self._apply_time_offsets(results, chunk_durations)
+        return self.merge_chunk_results(results)
+    
+    def transcribe_chunked_stream(
+        self,
+        audio_path: Path,
+        chunk_paths: List[Path],
+        chunk_durations: List[float],
+        language: Optional[str] = None,
+        prompt: Optional[str] = None,
+        max_concurrency: int = MAX_CONCURRENT_CHUNKS,
+        progress_callback=None
+    ) -> Iterator[Tuple[int, Dict, str]]:
+        """
+        Transcribe multiple audio chunks concurrently, yielding each as it completes.
+        
+        Chunks are uploaded from a thread pool but yielded in chunk order, so
+        callers can display partial transcripts while later chunks are still
+        in flight. Combine the yielded results with `merge_chunk_results`.
+        
+        Args:
+            audio_path: Original audio file path (for reference)
+            chunk_paths: List of chunk file paths
+            chunk_durations: Duration of each chunk for time offset calculation
+            language: Language code or None for auto-detect
+            prompt: Optional prompt to guide transcription style
+            max_concurrency: Maximum number of chunks transcribed at once
+            progress_callback: Optional callback for retry notices; called from
+                the consuming thread, not the upload workers
+        
+        Yields:
+            Tuples of (chunk index, chunk result with offset timestamps,
+            transcript text so far)
+        """
+        total = len(chunk_paths)
+        time_offsets = self._chunk_offsets(chunk_durations)
+        sizes_mb = self._file_sizes_mb(chunk_paths)
+        text_parts = []
+        
+        # Workers queue their retry notices; they are relayed here on the caller's
+        # thread (UI callbacks such as Streamlit's must not run on worker threads)
+        retry_notices = queue.SimpleQueue()
+        
+        def relay_notices():
+            while True:
                 try:
-                    chunk_result = self.transcribe(chunk_path, language=language, prompt=prompt)
-                    break  # Success, exit retry loop
-                except APIStatusError as e:
-                    if e.status_code >= 500 and attempt < max_retries:
-                        wait_time = 2 ** attempt  # 2, 4, 8, 16, 32 seconds
-                        print(f"⚠️ Server error on chunk {i} (attempt {attempt}/{max_retries}). "
-                              f"Retrying in {wait_time}s...")
-                        if progress_callback:
-                            progress_callback(
-                                f"⚠️ API error on chunk {i}, retrying in {wait_time}s "
-                                f"(attempt {attempt}/{max_retries})..."
-                            )
-                        time.sleep(wait_time)
-                    else:
-                        raise  # Re-raise for non-500 errors or final attempt
-            
-            if chunk_result is None:
-                raise RuntimeError(f"Failed to transcribe chunk {i} after {max_retries} attempts")
+                    notice = retry_notices.get_nowait()
+                except queue.Empty:
+                    return
+                progress_callback(notice)
+        
+        with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, total))) as executor:
+            futures = [
+                executor.submit(
+                    self._transcribe_with_retry, chunk_path, i, language, prompt,
+                    retry_notices.put if progress_callback else None,
+                    file_size_mb=sizes_mb.get(chunk_path)
+                )
+                for i, chunk_path in enumerate(chunk_paths, 1)
+            ]
             
-            # Adjust timestamps with cumulative offset
+            try:
+                for i, future in enumerate(futures, 1):
+                    if progress_callback:
+                        while wait([future], timeout=RETRY_NOTICE_POLL_SECONDS).not_done:
+                            relay_notices()
+                        relay_notices()
+                    chunk_result = future.result()
+                    self._shift_segments(chunk_result, time_offsets[i-1])
+                    
+                    text_parts.append(chunk_result['text'])
+                    yield i, chunk_result, ' '.join(text_parts)
+            finally:
+                # Don't start uploads nobody will consume (consumer stopped or a chunk failed)
+                for future in futures:
+                    future.cancel()
+    
+    def _transcribe_with_retry(
+        self,
+        chunk_path: Path,
+        chunk_index: int,
+        language: Optional[str],
+        prompt: Optional[str],
+        progress_callback=None,
+        file_size_mb: Optional[float] = None
+    ) -> Dict:
+        """Transcribe a single chunk, retrying transient API errors with backoff."""
+        logger.info("Transcribing chunk %d: %s", chunk_index, chunk_path.name)
+        
+        for attempt in range(1, MAX_CHUNK_ATTEMPTS + 1):
+            try:
+                return self.transcribe(
+                    chunk_path, language=language, prompt=prompt, file_size_mb=file_size_mb
+                )
+            except (APIStatusError, APIConnectionError) as e:
+                wait_time = self._retry_wait(e, chunk_index, attempt, progress_callback)
+                if wait_time is None:
+                    raise  # Non-retryable error or final attempt
+                time.sleep(wait_time)
+        
+        raise RuntimeError(f"Failed to transcribe chunk {chunk_index} after {MAX_CHUNK_ATTEMPTS} attempts")
+    
+    async def _atranscribe_with_retry(
+        self,
+        chunk_path: Path,
+        chunk_index: int,
+        language: Optional[str],
+        prompt: Optional[str],
+        progress_callback=None,
+        file_size_mb: Optional[float] = None
+    ) -> Dict:
+        """Async counterpart of `_transcribe_with_retry`, sleeping without blocking the loop."""
+        logger.info("Transcribing chunk %d: %s", chunk_index, chunk_path.name)
+        
+        for attempt in range(1, MAX_CHUNK_ATTEMPTS + 1):
+            try:
+                return await self.atranscribe(
+                    chunk_path, language=language, prompt=prompt, file_size_mb=file_size_mb
+                )
+            except (APIStatusError, APIConnectionError) as e:
+                wait_time = self._retry_wait(e, chunk_index, attempt, progress_callback)
+                if wait_time is None:
+                    raise  # Non-retryable error or final attempt
+                await asyncio.sleep(wait_time)
+        
+        raise RuntimeError(f"Failed to transcribe chunk {chunk_index} after {MAX_CHUNK_ATTEMPTS} attempts")
+    
+    def _retry_wait(
+        self,
+        error: Exception,
+        chunk_index: int,
+        attempt: int,
+        progress_callback=None
+    ) -> Optional[float]:
+        """
+        Decide whether a failed chunk attempt is retried, and report it if so.
+        
+        Shared by the sync and async retry loops, which only differ in how they sleep.
+        
+        Returns:
+            Seconds to wait before the next attempt, or None to re-raise the error
+        """
+        wait_time = self._retry_delay(error, attempt)
+        if wait_time is None or attempt >= MAX_CHUNK_ATTEMPTS:
+            return None
+        
+        logger.warning(
+            "⚠️ API error %s on chunk %d (attempt %d/%d). Retrying in %.1fs...",
+            getattr(error, 'status_code', type(error).__name__),
+            chunk_index, attempt, MAX_CHUNK_ATTEMPTS, wait_time
+        )
+        if progress_callback:
+            progress_callback(
+                f"⚠️ API error on chunk {chunk_index}, retrying in {wait_time:.1f}s "
+                f"(attempt {attempt}/{MAX_CHUNK_ATTEMPTS})..."
+            )
+        return wait_time
+    
+    @staticmethod
+    def _retry_delay(error: Exception, attempt: int) -> Optional[float]:
+        """
+        Seconds to wait before retrying after a failed attempt, or None if not retryable.
+        
+        Dropped connections and timeouts are retried once immediately, then back
+        off. Rate limits and transient server errors honor the server's
+        Retry-After header when present and otherwise always back off. Backoff
+        is exponential with up to 50% random jitter so concurrent chunks don't
+        retry in lockstep.
+        """
+        if isinstance(error, APIConnectionError):  # Includes APITimeoutError
+            if attempt == 1:
+                return 0.0
+        elif isinstance(error, APIStatusError) and error.status_code in RETRYABLE_STATUS_CODES:
+            retry_after = error.response.headers.get("retry-after")
+            if retry_after:
+                try:
+                    return min(MAX_BACKOFF_SECONDS, max(0.0, float(retry_after)))
+                except ValueError:
+                    pass  # HTTP-date form - fall back to our own backoff
+        else:
+            return None
+        
+        return min(MAX_BACKOFF_SECONDS, (2 ** attempt) * (1 + random.random() * 0.5))
+    
+    @staticmethod
+    def _file_sizes_mb(paths: List[Path]) -> Dict[Path, float]:
+        """Sizes in MB of the given files, read with one os.scandir pass per directory."""
+        wanted = set(paths)
+        sizes = {}
+        for directory in {path.parent for path in paths}:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    path = directory / entry.name
+                    if path in wanted:
+                        sizes[path] = entry.stat().st_size / (1024 * 1024)
+        return sizes
+    
+    @staticmethod
+    def _chunk_offsets(chunk_durations: List[float]) -> List[float]:
+        """Start time of each chunk, i.e. the cumulative duration of the chunks before it."""
+        return [0.0] + list(itertools.accumulate(chunk_durations))[:-1]
+    
+    @staticmethod
+    def _shift_segments(chunk_result: Dict, time_offset: float) -> None:
+        """Shift a chunk's segment timestamps in place by its start offset."""
+        # First chunk needs no shift
+        if time_offset:
             for seg in chunk_result['segments']:
-                seg['start'] += time_offset
-                seg['end'] += time_offset
-            
-            results.append(chunk_result)
-            
-            # Update time offset for next chunk
-            if i < len(chunk_durations):
-                time_offset += chunk_durations[i-1]
+                seg.start += time_offset
+                seg.end += time_offset
+    
+    @classmethod
+    def _apply_time_offsets(cls, results: List[Dict], chunk_durations: List[float]) -> None:
+        """Shift each chunk's segment timestamps by the cumulative duration of earlier chunks."""
+        for chunk_result, time_offset in zip(results, cls._chunk_offsets(chunk_durations)):
+            cls._shift_segments(chunk_result, time_offset)
+    
+    @staticmethod
+    def merge_chunk_results(results: List[Dict]) -> Dict:
+        """
+        Merge per-chunk results whose timestamps are already offset.
         
-        # Merge all results
-        all_segments = []
-        all_text_parts = []
-        total_confidence = 0.0
+        Args:
+            results: Chunk transcription results in chunk order
         
-        for result in results:
-            all_segments.extend(result['segments'])
-            all_text_parts.append(result['text'])
-            total_confidence += result.get('confidence', 0.0)
+        Returns:
+            Combined transcription result
+        """
+        all_segments = list(itertools.chain.from_iterable(r['segments'] for r in results))
+        total_confidence = sum(r.get('confidence', 0.0) for r in results)
         
         # Average confidence across chunks
         avg_confidence = total_confidence / len(results) if results else 0.0
         
         return {
-            'text': ' '.join(all_text_parts),
+            'text': ' '.join(r['text'] for r in results),
             'language': results[0]['language'] if results else 'unknown',
             'confidence': avg_confidence,
             'segments': all_segments
         }
-
-
-# Language mapping for dropdown
-SUPPORTED_LANGUAGES = {
-    'Auto-detect': None,
-    'English': 'en',
-    'Malay': 'ms',
-    'Chinese (Mandarin)': 'zh',
-    'Tamil': 'ta',
-    'Spanish': 'es',
-    'French': 'fr',
-    'German': 'de',
-    'Italian': 'it',
-    'Portuguese': 'pt',
-    'Russian': 'ru',
-    'Japanese': 'ja',
-    'Korean': 'ko',
-    'Arabic': 'ar',
-    'Hindi': 'hi',
-    'Bengali': 'bn',
-    'Turkish': 'tr',
-    'Vietnamese': 'vi',
-    'Thai': 'th',
-    'Indonesian': 'id',
-    'Dutch': 'nl',
-    'Polish': 'pl',
-    'Swedish': 'sv',
-    'Norwegian': 'no',
-    'Danish': 'da',
-    'Finnish': 'fi',
-    'Greek': 'el',
-    'Hebrew': 'he',
-    'Romanian': 'ro',
-    'Hungarian': 'hu',
-    'Czech': 'cs',
-    'Ukrainian': 'uk',
-}